@@ -4,6 +4,7 @@ Provides secure PostgreSQL connections with connection pooling.
 """
 import asyncio
 import logging
+import time
 from typing import Optional
 
 import asyncpg
@@ -20,14 +21,15 @@ class DatabaseManager:
     def __init__(self):
         self._pool: Optional[Pool] = None
         self._lock = asyncio.Lock()
+        self._ready = asyncio.Event()
 
     async def initialize(self) -> None:
         """Initialize database connection pool."""
-        if self._pool is not None:
+        if self._ready.is_set():
             return
 
         async with self._lock:
-            if self._pool is not None:
+            if self._ready.is_set():
                 return
 
             settings = get_settings()
@@ -35,8 +37,13 @@ class DatabaseManager:
             try:
                 self._pool = await asyncpg.create_pool(
                     settings.database_url,
-                    min_size=2,
-                    max_size=20,
+                    min_size=settings.db_min_size,
+                    max_size=settings.db_max_size,
+                    max_inactive_connection_lifetime=(
+                        settings.db_max_inactive_connection_lifetime
+                    ),
+                    max_queries=settings.db_max_queries,
+                    statement_cache_size=settings.db_statement_cache_size,
                     command_timeout=60,
                     server_settings={
                         'application_name': settings.app_name,
@@ -51,38 +58,50 @@ class DatabaseManager:
                     await conn.execute("SELECT 1")
 
                 logger.info("Database connection verified")
+                self._ready.set()
 
             except Exception as e:
-                logger.error(f"Failed to initialize database pool: {e}")
-                await self.close()
+                logger.error("Failed to initialize database pool: %s", e)
+                # The lock is already held here, so close the pool directly
+                await self._close_pool()
                 raise
 
-    async def get_connection(self):
-        """Get database connection from pool."""
-        if self._pool is None:
-            await self.initialize()
+    def get_connection(self):
+        """
+        Get a pool acquisition context for a database connection.
+
+        Raises:
+            RuntimeError: If the pool has not been initialized
+        """
+        if not self._ready.is_set():
+            raise RuntimeError("Database pool not initialized")
         return self._pool.acquire()
 
     async def close(self) -> None:
         """Close database connections."""
         async with self._lock:
-            if self._pool:
-                await self._pool.close()
-                self._pool = None
-                logger.info("Database connection pool closed")
+            await self._close_pool()
+
+    async def _close_pool(self) -> None:
+        """Close the pool; the caller must hold the lock."""
+        self._ready.clear()
+        if self._pool:
+            await self._pool.close()
+            self._pool = None
+            logger.info("Database connection pool closed")
+
     async def health_check(self) -> dict:
         """Perform database health check."""
         try:
             if self._pool is None:
                 return {"status": "error", "message": "Database not initialized"}
 
-            start_time = asyncio.get_event_loop().time()
+            start_time = time.perf_counter()
 
-            async with self._pool.acquire() as conn:
-                await conn.execute("SELECT 1")
+            # Bounded so a saturated pool cannot stall the health endpoint
+            await asyncio.wait_for(self._pool.fetchval("SELECT 1"), timeout=0.5)
 
-            end_time = asyncio.get_event_loop().time()
-            response_time = (end_time - start_time) * 1000
+            response_time = (time.perf_counter() - start_time) * 1000
 
             return {
                 "status": "healthy",
@@ -92,8 +111,11 @@ class DatabaseManager:
                 "pool_min_size": self._pool.get_min_size()
             }
 
+        except asyncio.TimeoutError:
+            logger.error("Database health check timed out")
+            return {"status": "timeout", "message": "Database health check timed out"}
         except Exception as e:
-            logger.error(f"Database health check failed: {e}")
+            logger.error("Database health check failed: %s", e)
             return {"status": "error", "message": str(e)}
 
 
@@ -102,7 +124,12 @@ db_manager = DatabaseManager()
 
 
 async def get_db_connection():
-    """Get database connection (dependency injection)."""
+    """
+    Get database connection (dependency injection).
+
+    The pool is initialized once by the application lifespan; this only
+    checks readiness and raises RuntimeError if startup has not run.
+    """
     async with db_manager.get_connection() as conn:
         yield conn
 
@@ -5,24 +5,29 @@ Implements all security requirements including CORS, rate limiting, and error ha
 import logging
 import time
 from contextlib import asynccontextmanager
-from typing import Any, Dict
+from typing import Any
 
+import orjson
 import uvicorn
 from fastapi import FastAPI, HTTPException, Request, status
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import Response
 
+from app.db.database import close_db, db_manager
+from app.middleware.liveness import LivenessASGIMiddleware
+from app.middleware.security import SecurityAndRateLimitMiddleware
 from app.routers import health, websocket
 from app.services.rate_limiter import rate_limiter
 from app.services.redis_service import close_redis, redis_manager
 from core.config import get_settings
 
-# Configure logging
+# Configure logging (level gated by LOG_LEVEL so disabled records are never formatted)
 logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    level=get_settings().log_level.upper(),
+    format=get_settings().log_format
 )
 logger = logging.getLogger(__name__)
 
@@ -38,14 +43,27 @@ async def lifespan(app: FastAPI):
         await redis_manager.initialize()
         logger.info("Redis connection pool initialized")
 
-        # Pre-load rate limiter script
-        await rate_limiter._ensure_script_loaded()
+        # Initialize database connection pool once; requests only check
+        # readiness. No route needs it yet, so an outage does not block
+        # startup: the pool stays not ready and get_db_connection fails fast
+        try:
+            await db_manager.initialize()
+        except Exception:
+            logger.warning("Database unavailable; continuing with it not ready")
+
+        # Pre-load the rate limiter script for the configured limits
+        settings = get_settings()
+        await rate_limiter._ensure_script_loaded((
+            settings.rate_limit_requests,
+            settings.rate_limit_window,
+            settings.rate_limit_burst,
+        ))
         logger.info("Rate limiter initialized")
 
         logger.info("Application startup completed")
 
     except Exception as e:
-        logger.error(f"Failed to start application: {e}")
+        logger.error("Failed to start application: %s", e)
         raise
 
     yield
@@ -58,10 +76,13 @@ async def lifespan(app: FastAPI):
         await close_redis()
         logger.info("Redis connections closed")
 
+        # Close database connections
+        await close_db()
+
         logger.info("Application shutdown completed")
 
     except Exception as e:
-        logger.error(f"Error during shutdown: {e}")
+        logger.error("Error during shutdown: %s", e)
 
 
 def create_app() -> FastAPI:
@@ -82,7 +103,7 @@ def create_app() -> FastAPI:
     _configure_security_middleware(app, settings)
 
     # Request middleware
-    _configure_request_middleware(app)
+    _configure_request_middleware(app, settings)
 
     # Error handlers
     _configure_error_handlers(app)
@@ -107,6 +128,9 @@ def _configure_security_middleware(app: FastAPI, settings):
         max_age=86400,  # 24 hours
     )
 
+    # Compress larger JSON payloads (e.g. /health/detailed)
+    app.add_middleware(GZipMiddleware, minimum_size=1000)
+
     # Trusted host middleware for production
     if not settings.debug:
         app.add_middleware(
@@ -115,81 +139,21 @@ def _configure_security_middleware(app: FastAPI, settings):
         )
 
 
-def _configure_request_middleware(app: FastAPI):
+def _configure_request_middleware(app: FastAPI, settings):
     """Configure request processing middleware."""
+    app.add_middleware(SecurityAndRateLimitMiddleware, settings=settings)
+
+    # Outermost: liveness probes are answered before any other middleware
+    app.add_middleware(LivenessASGIMiddleware)
 
-    @app.middleware("http")
-    async def rate_limiting_middleware(request: Request, call_next):
-        """Global rate limiting middleware."""
-        try:
-            # Extract client identifier
-            client_ip = request.client.host if request.client else "unknown"
-            forwarded_for = request.headers.get("X-Forwarded-For")
-            if forwarded_for:
-                client_ip = forwarded_for.split(",")[0].strip()
-
-            # Skip rate limiting for health checks
-            if request.url.path.startswith("/health"):
-                return await call_next(request)
-
-            # Check rate limit
-            rate_check = await rate_limiter.is_allowed(f"http:{client_ip}")
-
-            if not rate_check["allowed"]:
-                logger.warning(f"Rate limit exceeded for {client_ip}")
-                return JSONResponse(
-                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                    content={
-                        "error": "Rate limit exceeded",
-                        "retry_after": int(rate_check["reset_time"] - time.time()),
-                        "limit": rate_check["limit"],
-                        "remaining": rate_check["remaining"]
-                    },
-                    headers={
-                        "Retry-After": str(int(rate_check["reset_time"] - time.time())),
-                        "X-RateLimit-Limit": str(rate_check["limit"]),
-                        "X-RateLimit-Remaining": str(rate_check["remaining"]),
-                        "X-RateLimit-Reset": str(int(rate_check["reset_time"]))
-                    }
-                )
-
-            # Process request
-            start_time = time.time()
-            response = await call_next(request)
-            process_time = time.time() - start_time
-
-            # Add rate limit headers to response
-            response.headers["X-RateLimit-Limit"] = str(rate_check["limit"])
-            response.headers["X-RateLimit-Remaining"] = str(rate_check["remaining"])
-            response.headers["X-RateLimit-Reset"] = str(int(rate_check["reset_time"]))
-            response.headers["X-Process-Time"] = str(round(process_time * 1000, 2))
-
-            return response
-
-        except Exception as e:
-            logger.error(f"Rate limiting middleware error: {e}")
-            # Continue processing on middleware error
-            return await call_next(request)
-
-    @app.middleware("http")
-    async def security_headers_middleware(request: Request, call_next):
-        """Add security headers to all responses."""
-        response = await call_next(request)
-
-        # Security headers
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-        response.headers["Content-Security-Policy"] = (
-            "default-src 'self'; "
-            "script-src 'self' 'unsafe-inline'; "
-            "style-src 'self' 'unsafe-inline'; "
-            "img-src 'self' data: https:; "
-            "connect-src 'self' ws: wss:;"
-        )
 
-        return response
+def _json_response(status_code: int, content: Any) -> Response:
+    """Serialize an error payload with orjson."""
+    return Response(
+        content=orjson.dumps(content),
+        status_code=status_code,
+        media_type="application/json",
+    )
 
 
 def _configure_error_handlers(app: FastAPI):
@@ -200,10 +164,10 @@ def _configure_error_handlers(app: FastAPI):
         request: Request, exc: RequestValidationError
     ):
         """Handle request validation errors."""
-        logger.warning(f"Validation error for {request.url}: {exc}")
-        return JSONResponse(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            content={
+        logger.warning("Validation error for %s: %s", request.url, exc)
+        return _json_response(
+            status.HTTP_422_UNPROCESSABLE_ENTITY,
+            {
                 "error": "Validation error",
                 "details": exc.errors(),
                 "body": str(exc.body) if hasattr(exc, 'body') else None
@@ -213,9 +177,9 @@ def _configure_error_handlers(app: FastAPI):
     @app.exception_handler(HTTPException)
     async def http_exception_handler(request: Request, exc: HTTPException):
         """Handle HTTP exceptions."""
-        return JSONResponse(
-            status_code=exc.status_code,
-            content={
+        return _json_response(
+            exc.status_code,
+            {
                 "error": exc.detail,
                 "status_code": exc.status_code
             }
@@ -224,10 +188,10 @@ def _configure_error_handlers(app: FastAPI):
     @app.exception_handler(Exception)
     async def general_exception_handler(request: Request, exc: Exception):
         """Handle unexpected exceptions."""
-        logger.error(f"Unexpected error for {request.url}: {exc}", exc_info=True)
-        return JSONResponse(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            content={
+        logger.error("Unexpected error for %s: %s", request.url, exc, exc_info=True)
+        return _json_response(
+            status.HTTP_500_INTERNAL_SERVER_ERROR,
+            {
                 "error": "Internal server error",
                 "message": "An unexpected error occurred"
             }
@@ -235,33 +199,43 @@ def _configure_error_handlers(app: FastAPI):
 
 
 # Create app instance
+settings = get_settings()
 app = create_app()
 
 
+# Everything but the timestamp is static: serialize it once and splice the
+# timestamp in per request (the trailing "}" is re-added after it)
+_ROOT_STATIC = orjson.dumps({
+    "service": settings.app_name,
+    "version": settings.app_version,
+    "status": "running",
+    "endpoints": {
+        "health": "/health",
+        "websocket": "/ws/{client_id}",
+        "docs": "/docs" if settings.debug else "disabled in production"
+    }
+})[:-1]
+
+
 @app.get("/")
-async def root() -> Dict[str, Any]:
+async def root() -> Response:
     """Root endpoint with basic application information."""
-    settings = get_settings()
-    return {
-        "service": settings.app_name,
-        "version": settings.app_version,
-        "status": "running",
-        "timestamp": time.time(),
-        "endpoints": {
-            "health": "/health",
-            "websocket": "/ws/{client_id}",
-            "docs": "/docs" if settings.debug else "disabled in production"
-        }
-    }
+    body = _ROOT_STATIC + b',"timestamp":' + repr(time.time()).encode() + b"}"
+    return Response(content=body, media_type="application/json")
 
 
 if __name__ == "__main__":
-    settings = get_settings()
     uvicorn.run(
         "app.main:app",
         host=settings.host,
         port=settings.port,
         log_level=settings.log_level.lower(),
         reload=settings.debug,
-        access_log=True
+        access_log=True,
+        # loop defaults to "auto": uvloop where installed (not on Windows)
+        http="httptools",
+        ws_ping_interval=settings.websocket_ping_interval,
+        ws_ping_timeout=settings.websocket_ping_timeout,
+        # Frames are capped at 16KB; compressing them costs more CPU than it saves
+        ws_per_message_deflate=False
     )
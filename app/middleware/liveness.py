@@ -0,0 +1,43 @@
+"""
+Liveness fast path served ahead of the middleware stack.
+Answers /health/liveness without routing, validation or JSON encoding.
+"""
+import time
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.middleware.security import STATIC_SECURITY_HEADERS
+
+LIVENESS_PATH = "/health/liveness"
+
+_LIVENESS_PREFIX = b'{"status":"alive","timestamp":"'
+_LIVENESS_SUFFIX = b'"}'
+
+
+class LivenessASGIMiddleware:
+    """Serve the liveness probe directly, bypassing all inner middleware."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["path"] != LIVENESS_PATH
+            or scope["method"] not in ("GET", "HEAD")
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        body = _LIVENESS_PREFIX + str(time.time()).encode() + _LIVENESS_SUFFIX
+        headers = [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+        ]
+        headers.extend(STATIC_SECURITY_HEADERS)
+
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        await send({
+            "type": "http.response.body",
+            "body": b"" if scope["method"] == "HEAD" else body,
+        })
@@ -3,11 +3,11 @@ WebSocket router with 16KB message size enforcement.
 Provides secure WebSocket communication with rate limiting and message validation.
 """
 import asyncio
-import json
 import logging
 import time
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Set
 
+import orjson
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
 from app.services.rate_limiter import rate_limiter
@@ -17,13 +17,54 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/ws", tags=["websocket"])
 
+# Outbound frames buffered per client before it is dropped as a slow consumer
+SEND_QUEUE_MAX_SIZE = 256
+
+# Error payloads are pre-serialized; only the numeric fields are formatted in
+_MESSAGE_TOO_LARGE_TPL = (
+    '{"error":"Message too large","max_size_bytes":%d,"received_size_bytes":%d}'
+)
+_OUTGOING_TOO_LARGE_TPL = '{"error":"Message too large","max_size":%d}'
+_RATE_LIMIT_TPL = '{"error":"Rate limit exceeded","retry_after":%.3f}'
+_PROCESSING_FAILED = '{"error":"Failed to process message"}'
+
+# First character of frames worth attempting to parse as JSON (str or bytes)
+_JSON_PREFIXES = frozenset(('{', '[', '"', b'{', b'[', b'"'))
+
+
+class ConnectionMetrics:
+    """Per-connection counters, slotted to keep per-client overhead small."""
+
+    __slots__ = (
+        "connected_at",
+        "messages_sent",
+        "messages_received",
+        "bytes_sent",
+        "bytes_received",
+        "last_activity",
+    )
+
+    def __init__(self, connected_at: float):
+        self.connected_at = connected_at
+        self.messages_sent = 0
+        self.messages_received = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.last_activity = connected_at
+
 
 class ConnectionManager:
     """Manages WebSocket connections with security and monitoring."""
 
     def __init__(self):
         self.active_connections: Dict[str, WebSocket] = {}
-        self.connection_metadata: Dict[str, Dict[str, Any]] = {}
+        self.connection_metadata: Dict[str, ConnectionMetrics] = {}
+        # Each client has one writer task draining its outbound queue, so
+        # producers never await the socket and writes are never interleaved
+        self._send_queues: Dict[str, asyncio.Queue] = {}
+        self._writer_tasks: Dict[str, asyncio.Task] = {}
+        # Pending closes of dropped sockets, referenced until they finish
+        self._close_tasks: Set[asyncio.Task] = set()
 
     async def connect(self, websocket: WebSocket, client_id: str) -> bool:
         """
@@ -40,97 +81,156 @@ class ConnectionManager:
             # Check rate limiting
             rate_check = await rate_limiter.is_allowed(f"ws_connect:{client_id}")
             if not rate_check["allowed"]:
-                logger.warning(f"WebSocket connection rate limited for {client_id}")
+                logger.warning("WebSocket connection rate limited for %s", client_id)
                 await websocket.close(code=4008, reason="Rate limit exceeded")
                 return False
 
             await websocket.accept()
 
+            # A reconnect reusing the ID replaces the old entry; cancel its
+            # writer so it does not outlive the socket it was draining
+            if client_id in self._send_queues:
+                self.disconnect(client_id)
+
             # Store connection
             self.active_connections[client_id] = websocket
-            self.connection_metadata[client_id] = {
-                "connected_at": time.time(),
-                "messages_sent": 0,
-                "messages_received": 0,
-                "bytes_sent": 0,
-                "bytes_received": 0,
-                "last_activity": time.time()
-            }
+            self.connection_metadata[client_id] = ConnectionMetrics(time.time())
+            queue: asyncio.Queue = asyncio.Queue(maxsize=SEND_QUEUE_MAX_SIZE)
+            self._send_queues[client_id] = queue
+            self._writer_tasks[client_id] = asyncio.create_task(
+                self._writer(client_id, websocket, queue)
+            )
 
-            logger.info(f"WebSocket connection established for {client_id}")
+            logger.info("WebSocket connection established for %s", client_id)
             return True
 
         except Exception as e:
             logger.error(
-                f"Failed to establish WebSocket connection for {client_id}: {e}"
+                "Failed to establish WebSocket connection for %s: %s", client_id, e
             )
             return False
 
-    def disconnect(self, client_id: str):
-        """Disconnect and cleanup client."""
-        if client_id in self.active_connections:
-            del self.active_connections[client_id]
+    def disconnect(self, client_id: str, websocket: Optional[WebSocket] = None):
+        """
+        Disconnect and cleanup client.
 
-        if client_id in self.connection_metadata:
-            metadata = self.connection_metadata[client_id]
-            duration = time.time() - metadata["connected_at"]
+        Args:
+            client_id: Client ID to disconnect
+            websocket: Socket being torn down; if given and a reconnect has
+                since registered a different socket under client_id, the
+                newer connection is left untouched
+        """
+        if (
+            websocket is not None
+            and self.active_connections.get(client_id) is not websocket
+        ):
+            return
+
+        self.active_connections.pop(client_id, None)
+
+        # Dropping the queue discards any frames still pending for the client
+        self._send_queues.pop(client_id, None)
+        writer_task = self._writer_tasks.pop(client_id, None)
+        if writer_task is not None and writer_task is not asyncio.current_task():
+            writer_task.cancel()
+
+        metadata = self.connection_metadata.pop(client_id, None)
+        if metadata is not None:
+            duration = time.time() - metadata.connected_at
             logger.info(
-                f"WebSocket disconnected for {client_id}. "
-                f"Duration: {duration:.2f}s, "
-                f"Messages: {metadata['messages_received']}/"
-                f"{metadata['messages_sent']}, "
-                f"Bytes: {metadata['bytes_received']}/{metadata['bytes_sent']}"
+                "WebSocket disconnected for %s. "
+                "Duration: %.2fs, Messages: %s/%s, Bytes: %s/%s",
+                client_id, duration,
+                metadata.messages_received, metadata.messages_sent,
+                metadata.bytes_received, metadata.bytes_sent
             )
-            del self.connection_metadata[client_id]
 
-    async def send_personal_message(self, message: str, client_id: str) -> bool:
+    async def send_personal_message(
+        self, message: str, client_id: str, max_size: Optional[int] = None
+    ) -> bool:
         """
         Send message to specific client.
 
         Args:
             message: Message to send
             client_id: Target client ID
+            max_size: Maximum message size in bytes (defaults to config)
 
         Returns:
             bool: True if message sent successfully
         """
-        try:
-            if client_id not in self.active_connections:
-                return False
+        if client_id not in self.active_connections:
+            return False
 
-            websocket = self.active_connections[client_id]
-
-            # Check message size
-            message_bytes = len(message.encode('utf-8'))
-            settings = get_settings()
-
-            if message_bytes > settings.websocket_max_message_size:
-                logger.warning(
-                    f"Outgoing message too large for {client_id}: "
-                    f"{message_bytes} > {settings.websocket_max_message_size} bytes"
-                )
-                await websocket.send_text(json.dumps({
-                    "error": "Message too large",
-                    "max_size": settings.websocket_max_message_size
-                }))
-                return False
+        # Check message size
+        message_bytes = len(message.encode('utf-8'))
+        if max_size is None:
+            max_size = get_settings().websocket_max_message_size
 
-            await websocket.send_text(message)
+        if message_bytes > max_size:
+            logger.warning(
+                "Outgoing message too large for %s: %s > %s bytes",
+                client_id, message_bytes, max_size
+            )
+            error = _OUTGOING_TOO_LARGE_TPL % max_size
+            self._enqueue(client_id, error, len(error))
+            return False
 
-            # Update metrics
-            if client_id in self.connection_metadata:
-                metadata = self.connection_metadata[client_id]
-                metadata["messages_sent"] += 1
-                metadata["bytes_sent"] += message_bytes
-                metadata["last_activity"] = time.time()
+        return self._enqueue(client_id, message, message_bytes)
 
-            return True
+    def _enqueue(self, client_id: str, message: str, message_bytes: int) -> bool:
+        """
+        Queue a message whose encoded size has already been checked.
 
-        except Exception as e:
-            logger.error(f"Failed to send message to {client_id}: {e}")
+        Args:
+            client_id: Target client ID
+            message: Message to send
+            message_bytes: UTF-8 encoded size of the message
+
+        Returns:
+            bool: True if message was queued for sending
+        """
+        queue = self._send_queues.get(client_id)
+        if queue is None:
+            return False
+
+        try:
+            queue.put_nowait((message, message_bytes))
+        except asyncio.QueueFull:
+            logger.warning(
+                "Send queue full for %s, disconnecting slow consumer", client_id
+            )
+            websocket = self.active_connections.get(client_id)
             self.disconnect(client_id)
+            if websocket is not None:
+                # Closing also ends the endpoint's receive loop
+                task = asyncio.create_task(websocket.close(code=1013))
+                self._close_tasks.add(task)
+                task.add_done_callback(self._close_tasks.discard)
             return False
 
+        return True
+
+    async def _writer(
+        self, client_id: str, websocket: WebSocket, queue: asyncio.Queue
+    ):
+        """Drain a client's send queue onto its socket."""
+        while True:
+            message, message_bytes = await queue.get()
+            try:
+                await websocket.send_text(message)
+            except Exception as e:
+                logger.error("Failed to send message to %s: %s", client_id, e)
+                self.disconnect(client_id, websocket)
+                return
+
+            # Update metrics
+            metadata = self.connection_metadata.get(client_id)
+            if metadata is not None:
+                metadata.messages_sent += 1
+                metadata.bytes_sent += message_bytes
+                metadata.last_activity = time.time()
+
     async def broadcast(self, message: str, exclude_client: Optional[str] = None):
         """
         Broadcast message to all connected clients.
@@ -139,34 +239,48 @@ class ConnectionManager:
             message: Message to broadcast
             exclude_client: Client ID to exclude from broadcast
         """
-        disconnected_clients = []
-
-        for client_id, _websocket in self.active_connections.items():
-            if exclude_client and client_id == exclude_client:
-                continue
-
-            try:
-                success = await self.send_personal_message(message, client_id)
-                if not success:
-                    disconnected_clients.append(client_id)
-            except Exception as e:
-                logger.error(f"Broadcast failed for {client_id}: {e}")
-                disconnected_clients.append(client_id)
+        # Snapshot targets: disconnects may mutate the dict during fan-out
+        targets = tuple(
+            client_id for client_id in tuple(self.active_connections)
+            if client_id != exclude_client
+        )
+        if not targets:
+            return
+
+        # Encode and size-check once for all recipients
+        message_bytes = len(message.encode('utf-8'))
+        max_size = get_settings().websocket_max_message_size
+        if message_bytes > max_size:
+            logger.warning(
+                "Broadcast message too large: %s > %s bytes", message_bytes, max_size
+            )
+            return
 
-        # Cleanup disconnected clients
-        for client_id in disconnected_clients:
-            self.disconnect(client_id)
+        # Fan-out only enqueues; each client's writer task does the socket
+        # I/O, so one slow socket never stalls the others and clients that
+        # fall too far behind are disconnected by _enqueue. Each recipient
+        # gets exactly one frame on its own socket, so there are no
+        # same-socket writes to coalesce (TCP_CORK / buffered writev would
+        # not help here, and ASGI does not expose the raw socket anyway).
+        for client_id in targets:
+            self._enqueue(client_id, message, message_bytes)
 
     def get_connection_stats(self) -> Dict[str, Any]:
         """Get connection statistics."""
+        now = time.time()
         return {
             "total_connections": len(self.active_connections),
             "connections": {
                 client_id: {
-                    **metadata,
-                    "connected_duration": time.time() - metadata["connected_at"]
+                    "connected_at": m.connected_at,
+                    "messages_sent": m.messages_sent,
+                    "messages_received": m.messages_received,
+                    "bytes_sent": m.bytes_sent,
+                    "bytes_received": m.bytes_received,
+                    "last_activity": m.last_activity,
+                    "connected_duration": now - m.connected_at
                 }
-                for client_id, metadata in self.connection_metadata.items()
+                for client_id, m in self.connection_metadata.items()
             }
         }
 
@@ -185,6 +299,7 @@ async def websocket_endpoint(websocket: WebSocket, client_id: str):
         client_id: Unique client identifier
     """
     settings = get_settings()
+    max_size = settings.websocket_max_message_size
 
     # Validate client_id
     if not client_id or len(client_id) > 100:
@@ -207,88 +322,106 @@ async def websocket_endpoint(websocket: WebSocket, client_id: str):
                     break
 
                 if data["type"] == "websocket.receive":
+                    # One clock read per frame, shared by everything below
+                    now = time.time()
+
                     if "bytes" in data:
-                        message_bytes = data["bytes"]
+                        payload = data["bytes"]
+                        payload_size = len(payload)
                     elif "text" in data:
-                        message_bytes = data["text"].encode('utf-8')
+                        # Keep text as str; ASCII text (the common case) has one
+                        # byte per character, so only non-ASCII needs encoding
+                        payload = data["text"]
+                        payload_size = (
+                            len(payload) if payload.isascii()
+                            else len(payload.encode('utf-8'))
+                        )
                     else:
                         continue
 
                     # Check message size
-                    if len(message_bytes) > settings.websocket_max_message_size:
+                    if payload_size > max_size:
                         logger.warning(
-                            f"Message too large from {client_id}: "
-                            f"{len(message_bytes)} > "
-                            f"{settings.websocket_max_message_size} bytes"
+                            "Message too large from %s: %s > %s bytes",
+                            client_id, payload_size, max_size
                         )
 
-                        await websocket.send_text(json.dumps({
-                            "error": "Message too large",
-                            "max_size_bytes": settings.websocket_max_message_size,
-                            "received_size_bytes": len(message_bytes)
-                        }))
+                        await manager.send_personal_message(
+                            _MESSAGE_TOO_LARGE_TPL % (max_size, payload_size),
+                            client_id,
+                            max_size
+                        )
                         continue
 
-                    # Convert to text if received as bytes
-                    if isinstance(message_bytes, bytes):
-                        message_text = message_bytes.decode('utf-8')
-                    else:
-                        message_text = message_bytes
-
                     # Rate limiting check
                     rate_check = await rate_limiter.is_allowed(
                         f"ws_message:{client_id}"
                     )
                     if not rate_check["allowed"]:
-                        await websocket.send_text(json.dumps({
-                            "error": "Rate limit exceeded",
-                            "retry_after": rate_check["reset_time"] - time.time()
-                        }))
+                        await manager.send_personal_message(
+                            _RATE_LIMIT_TPL % (rate_check["reset_time"] - now),
+                            client_id,
+                            max_size
+                        )
                         continue
 
                     # Update receive metrics
-                    if client_id in manager.connection_metadata:
-                        metadata = manager.connection_metadata[client_id]
-                        metadata["messages_received"] += 1
-                        metadata["bytes_received"] += len(message_bytes)
-                        metadata["last_activity"] = time.time()
-
-                    # Process message
-                    try:
-                        # Try to parse as JSON
-                        message_data = json.loads(message_text)
-                        await handle_message(client_id, message_data)
-                    except json.JSONDecodeError:
+                    metadata = manager.connection_metadata.get(client_id)
+                    if metadata is not None:
+                        metadata.messages_received += 1
+                        metadata.bytes_received += payload_size
+                        metadata.last_activity = now
+
+                    # Process message; only frames that look like JSON are
+                    # parsed, so plain text never pays for a failed parse
+                    message_data = None
+                    if payload.lstrip()[:1] in _JSON_PREFIXES:
+                        try:
+                            message_data = orjson.loads(payload)
+                        except orjson.JSONDecodeError:
+                            message_data = None
+
+                    if message_data is None:
                         # Handle as plain text
-                        await handle_text_message(client_id, message_text)
+                        if isinstance(payload, bytes):
+                            payload = payload.decode('utf-8')
+                        await handle_text_message(client_id, payload, now)
+                    else:
+                        await handle_message(client_id, message_data, now)
 
             except asyncio.TimeoutError:
                 # Send ping to check connection
                 await websocket.ping()
 
     except WebSocketDisconnect:
-        logger.info(f"WebSocket client {client_id} disconnected")
+        logger.info("WebSocket client %s disconnected", client_id)
     except Exception as e:
-        logger.error(f"WebSocket error for {client_id}: {e}")
+        logger.error("WebSocket error for %s: %s", client_id, e)
     finally:
-        manager.disconnect(client_id)
+        manager.disconnect(client_id, websocket)
 
 
-async def handle_message(client_id: str, message_data: Dict[str, Any]):
+async def handle_message(
+    client_id: str, message_data: Dict[str, Any], now: Optional[float] = None
+):
     """
     Handle structured JSON message.
 
     Args:
         client_id: Client identifier
         message_data: Parsed JSON message
+        now: Receive timestamp of the message (defaults to current time)
     """
+    if now is None:
+        now = time.time()
+
     try:
         message_type = message_data.get("type", "unknown")
 
         if message_type == "ping":
             # Respond to ping
             await manager.send_personal_message(
-                json.dumps({"type": "pong", "timestamp": time.time()}),
+                orjson.dumps({"type": "pong", "timestamp": now}).decode(),
                 client_id
             )
 
@@ -297,54 +430,59 @@ async def handle_message(client_id: str, message_data: Dict[str, Any]):
             response = {
                 "type": "echo_response",
                 "original_message": message_data,
-                "timestamp": time.time()
+                "timestamp": now
             }
-            await manager.send_personal_message(json.dumps(response), client_id)
+            await manager.send_personal_message(
+                orjson.dumps(response).decode(), client_id
+            )
 
         elif message_type == "broadcast":
             # Broadcast to all clients
             if "message" in message_data:
-                broadcast_msg = json.dumps({
+                broadcast_msg = orjson.dumps({
                     "type": "broadcast",
                     "from": client_id,
                     "message": message_data["message"],
-                    "timestamp": time.time()
-                })
+                    "timestamp": now
+                }).decode()
                 await manager.broadcast(broadcast_msg, exclude_client=client_id)
 
         else:
             # Unknown message type
             await manager.send_personal_message(
-                json.dumps({
+                orjson.dumps({
                     "error": f"Unknown message type: {message_type}",
                     "supported_types": ["ping", "echo", "broadcast"]
-                }),
+                }).decode(),
                 client_id
             )
 
     except Exception as e:
-        logger.error(f"Error handling message from {client_id}: {e}")
-        await manager.send_personal_message(
-            json.dumps({"error": "Failed to process message"}),
-            client_id
-        )
+        logger.error("Error handling message from %s: %s", client_id, e)
+        await manager.send_personal_message(_PROCESSING_FAILED, client_id)
 
 
-async def handle_text_message(client_id: str, message_text: str):
+async def handle_text_message(
+    client_id: str, message_text: str, now: Optional[float] = None
+):
     """
     Handle plain text message.
 
     Args:
         client_id: Client identifier
         message_text: Plain text message
+        now: Receive timestamp of the message (defaults to current time)
     """
+    if now is None:
+        now = time.time()
+
     # Simple echo for text messages
-    response = json.dumps({
+    response = orjson.dumps({
         "type": "text_echo",
         "message": message_text,
         "from": client_id,
-        "timestamp": time.time()
-    })
+        "timestamp": now
+    }).decode()
     await manager.send_personal_message(response, client_id)
 
 
@@ -1,75 +1,110 @@
 """
 Atomic rate limiter using Redis with EVALSHA for high performance.
-Implements sliding window rate limiting with burst protection.
+Implements token bucket rate limiting with burst protection.
+Checks issued in the same event-loop tick share one pipelined round trip.
 """
+import asyncio
 import logging
+import math
 import time
-from typing import Any, Dict, Optional
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
 
-from app.services.redis_service import get_redis
+from redis.exceptions import NoScriptError
+
+from app.services.redis_service import get_redis, get_redis_sync
 from core.config import get_settings
 
 logger = logging.getLogger(__name__)
 
+# Local cache of denied identifiers, checked before going to Redis
+DENY_CACHE_MAX_SIZE = 10_000
+DENY_CACHE_SWEEP_INTERVAL = 1_000  # calls between expired-entry sweeps
+
 
 class RateLimiter:
     """Atomic rate limiter using Redis EVALSHA operations."""
 
     def __init__(self):
-        self._script_sha: Optional[str] = None
-        self._lua_script = """
+        # (limit, window, burst_limit) -> SHA of the script specialized for it
+        self._script_shas: Dict[Tuple[int, int, int], str] = {}
+        # key -> denial result, valid until its reset_time (LRU ordered)
+        self._deny_cache: OrderedDict[str, Dict[str, Any]] = OrderedDict()
+        self._calls_since_sweep = 0
+        # Checks waiting for the next pipelined batch
+        self._pending: List[Tuple[Tuple[Any, ...], asyncio.Future]] = []
+        self._drain_task: Optional[asyncio.Task] = None
+        # Rendered once per (limit, window, burst_limit) with the parameters
+        # inlined as constants, so each call only passes the key and time
+        self._lua_template = """
             local key = KEYS[1]
-            local window = tonumber(ARGV[1])
-            local limit = tonumber(ARGV[2])
-            local current_time = tonumber(ARGV[3])
-            local burst_limit = tonumber(ARGV[4])
-
-            -- Remove expired entries
-            redis.call('ZREMRANGEBYSCORE', key, 0, current_time - window)
-
-            -- Count current requests in window
-            local current_count = redis.call('ZCARD', key)
-
-            -- Check if limit exceeded
-            if current_count >= limit then
-                -- Return rate limit info
-                local oldest_score = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
-                local reset_time = 0
-                if oldest_score[2] then
-                    reset_time = oldest_score[2] + window
-                end
+            local current_time = tonumber(ARGV[1])
+
+            -- Token bucket: refills at limit/window tokens per second and
+            -- holds at most burst_limit tokens
+            local limit = %(limit)d
+            local capacity = %(capacity)d
+            local rate = %(rate)r
+
+            local state = redis.call('HMGET', key, 'tokens', 'ts')
+            local tokens = tonumber(state[1])
+            if tokens == nil then
+                tokens = capacity
+            else
+                local elapsed = math.max(0, current_time - tonumber(state[2]))
+                tokens = math.min(capacity, tokens + elapsed * rate)
+            end
 
+            if tokens < 1 then
+                -- Denied: state is left untouched, refill is recomputed from
+                -- the stored timestamp next time. Reset is when the next
+                -- token becomes available.
                 return {
                     0,  -- allowed (false)
-                    current_count,  -- current count
+                    capacity,  -- tokens consumed
                     limit,  -- limit
-                    reset_time,  -- reset time
-                    limit - current_count  -- remaining
+                    tostring(current_time + (1 - tokens) / rate),  -- reset time
+                    0  -- remaining
                 }
             end
 
-            -- Add current request
-            redis.call('ZADD', key, current_time, current_time .. ':' .. math.random())
+            tokens = tokens - 1
+            redis.call('HSET', key, 'tokens', tokens, 'ts', current_time)
 
-            -- Set expiry for cleanup
-            redis.call('EXPIRE', key, window + 1)
+            -- A full bucket is equivalent to no key, so expire once refilled
+            redis.call('EXPIRE', key, %(ttl)d)
 
-            -- Return success info
+            local remaining = math.floor(tokens)
             return {
                 1,  -- allowed (true)
-                current_count + 1,  -- current count
+                capacity - remaining,  -- tokens consumed
                 limit,  -- limit
-                current_time + window,  -- reset time
-                limit - current_count - 1  -- remaining
+                tostring(current_time + (capacity - tokens) / rate),  -- reset time
+                remaining  -- remaining
             }
         """
 
-    async def _ensure_script_loaded(self):
-        """Ensure Lua script is loaded in Redis."""
-        if self._script_sha is None:
+    def _render_script(self, params: Tuple[int, int, int]) -> str:
+        """Render the Lua script specialized for (limit, window, burst_limit)."""
+        limit, window, burst_limit = params
+        rate = limit / window
+        return self._lua_template % {
+            "limit": limit,
+            "capacity": burst_limit,
+            "rate": rate,
+            # A full bucket is the same as no key, so state expires once refilled
+            "ttl": math.ceil(burst_limit / rate) + 1,
+        }
+
+    async def _ensure_script_loaded(self, params: Tuple[int, int, int]) -> str:
+        """Ensure the script for params is loaded in Redis and return its SHA."""
+        sha = self._script_shas.get(params)
+        if sha is None:
             redis_client = await get_redis()
-            self._script_sha = await redis_client.script_load(self._lua_script)
-            logger.debug(f"Rate limiter script loaded with SHA: {self._script_sha}")
+            sha = await redis_client.script_load(self._render_script(params))
+            self._script_shas[params] = sha
+            logger.debug("Rate limiter script for %s loaded with SHA: %s", params, sha)
+        return sha
 
     async def is_allowed(
         self,
@@ -85,41 +120,39 @@ class RateLimiter:
             identifier: Unique identifier for rate limiting (IP, user ID, etc.)
             limit: Requests allowed per window (defaults to config)
             window: Time window in seconds (defaults to config)
-            burst_limit: Maximum burst requests (defaults to config)
+            burst_limit: Bucket capacity, i.e. maximum burst (defaults to config)
 
         Returns:
             Dictionary with rate limit information:
             - allowed: bool - Whether request is allowed
-            - current_count: int - Current request count in window
+            - current_count: int - Tokens currently consumed from the bucket
             - limit: int - Request limit per window
-            - reset_time: float - When the window resets
-            - remaining: int - Remaining requests in window
+            - reset_time: float - When the next token is available if denied,
+              otherwise when the bucket is full again
+            - remaining: int - Requests that can be made right now
         """
         try:
-            await self._ensure_script_loaded()
-
-            settings = get_settings()
-            limit = limit or settings.rate_limit_requests
-            window = window or settings.rate_limit_window
-            burst_limit = burst_limit or settings.rate_limit_burst
-
             current_time = time.time()
             key = f"rate_limit:{identifier}"
 
-            redis_client = await get_redis()
+            # Known-denied identifiers are answered without a Redis round trip
+            cached = self._get_cached_denial(key, current_time)
+            if cached is not None:
+                return cached
 
-            # Execute atomic rate limit check
-            result = await redis_client.evalsha(
-                self._script_sha,
-                1,  # Number of keys
-                key,
-                window,
-                limit,
-                current_time,
-                burst_limit
-            )
+            if not (limit and window and burst_limit):
+                settings = get_settings()
+                limit = limit or settings.rate_limit_requests
+                window = window or settings.rate_limit_window
+                burst_limit = burst_limit or settings.rate_limit_burst
 
-            return {
+            params = (limit, window, burst_limit)
+            sha = await self._ensure_script_loaded(params)
+
+            # Execute atomic rate limit check (batched with concurrent checks)
+            result = await self._submit((sha, params, key, current_time))
+
+            rate_check = {
                 "allowed": bool(result[0]),
                 "current_count": int(result[1]),
                 "limit": int(result[2]),
@@ -127,8 +160,13 @@ class RateLimiter:
                 "remaining": max(0, int(result[4]))
             }
 
+            if not rate_check["allowed"]:
+                self._cache_denial(key, rate_check)
+
+            return rate_check
+
         except Exception as e:
-            logger.error(f"Rate limit check failed for {identifier}: {e}")
+            logger.error("Rate limit check failed for %s: %s", identifier, e)
             # Fail open for availability, but log the error
             return {
                 "allowed": True,
@@ -139,6 +177,112 @@ class RateLimiter:
                 "error": str(e)
             }
 
+    async def _submit(self, args: Tuple[Any, ...]) -> Any:
+        """Queue a script call for the next pipelined batch and await its result."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((args, future))
+
+        # The drain task runs on the next loop iteration, after every check
+        # already scheduled in this tick has queued itself
+        if self._drain_task is None:
+            self._drain_task = loop.create_task(self._drain())
+
+        return await future
+
+    async def _drain(self) -> None:
+        """Execute all pending script calls in one pipeline and resolve them."""
+        batch, self._pending = self._pending, []
+        self._drain_task = None
+
+        try:
+            results = await self._execute_batch([args for args, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results, strict=True):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    async def _execute_batch(self, batch: List[Tuple[Any, ...]]) -> List[Any]:
+        """
+        Run the rate limit script once per entry in a single round trip.
+
+        Returns:
+            One script result or exception per entry, in order
+        """
+        # is_allowed() already ran _ensure_script_loaded, which initializes Redis
+        redis_client = get_redis_sync()
+        results = await self._pipeline_evalsha(redis_client, batch)
+
+        # Script cache was flushed (restart/failover): reload and retry those
+        missing = [i for i, r in enumerate(results) if isinstance(r, NoScriptError)]
+        if missing:
+            logger.warning("Rate limiter script missing from Redis, reloading")
+            for params in {batch[i][1] for i in missing}:
+                self._script_shas[params] = await redis_client.script_load(
+                    self._render_script(params)
+                )
+            retried = await self._pipeline_evalsha(
+                redis_client, [batch[i] for i in missing]
+            )
+            for i, result in zip(missing, retried, strict=True):
+                results[i] = result
+
+        return results
+
+    async def _pipeline_evalsha(
+        self, redis_client: Any, batch: List[Tuple[Any, ...]]
+    ) -> List[Any]:
+        """Queue one EVALSHA per entry on a non-transactional pipeline."""
+        async with redis_client.pipeline(transaction=False) as pipe:
+            for sha, _params, key, current_time in batch:
+                pipe.evalsha(sha, 1, key, current_time)
+            return await pipe.execute(raise_on_error=False)
+
+    def _get_cached_denial(
+        self, key: str, current_time: float
+    ) -> Optional[Dict[str, Any]]:
+        """Return a cached denial for key if it has not expired yet."""
+        self._calls_since_sweep += 1
+        if self._calls_since_sweep >= DENY_CACHE_SWEEP_INTERVAL:
+            self._sweep_deny_cache(current_time)
+
+        cached = self._deny_cache.get(key)
+        if cached is None:
+            return None
+
+        if cached["reset_time"] > current_time:
+            self._deny_cache.move_to_end(key)
+            return cached
+
+        del self._deny_cache[key]
+        return None
+
+    def _cache_denial(self, key: str, rate_check: Dict[str, Any]) -> None:
+        """Remember a denial until its window resets, evicting LRU entries."""
+        self._deny_cache[key] = rate_check
+        self._deny_cache.move_to_end(key)
+        if len(self._deny_cache) > DENY_CACHE_MAX_SIZE:
+            self._deny_cache.popitem(last=False)
+
+    def _sweep_deny_cache(self, current_time: float) -> None:
+        """Drop all expired denials."""
+        self._calls_since_sweep = 0
+        expired = [
+            key for key, rate_check in self._deny_cache.items()
+            if rate_check["reset_time"] <= current_time
+        ]
+        for key in expired:
+            del self._deny_cache[key]
+
     async def reset_limit(self, identifier: str) -> bool:
         """
         Reset rate limit for identifier.
@@ -152,12 +296,13 @@ class RateLimiter:
         try:
             redis_client = await get_redis()
             key = f"rate_limit:{identifier}"
+            self._deny_cache.pop(key, None)
             result = await redis_client.delete(key)
-            logger.info(f"Rate limit reset for {identifier}")
+            logger.info("Rate limit reset for %s", identifier)
             return bool(result)
 
         except Exception as e:
-            logger.error(f"Failed to reset rate limit for {identifier}: {e}")
+            logger.error("Failed to reset rate limit for %s: %s", identifier, e)
             return False
 
     async def get_stats(self, identifier: str) -> Dict[str, Any]:
@@ -174,27 +319,20 @@ class RateLimiter:
             redis_client = await get_redis()
             key = f"rate_limit:{identifier}"
 
-            # Get current count
-            current_count = await redis_client.zcard(key)
-
-            # Get oldest and newest entries
-            oldest = await redis_client.zrange(key, 0, 0, withscores=True)
-            newest = await redis_client.zrange(key, -1, -1, withscores=True)
+            # Bucket state as of the last admitted request
+            tokens, last_request = await redis_client.hmget(key, "tokens", "ts")
 
             stats = {
-                "current_count": current_count,
-                "oldest_request": oldest[0][1] if oldest else None,
-                "newest_request": newest[0][1] if newest else None,
-                "window_start": oldest[0][1] if oldest else None,
-                "window_end": (
-                    oldest[0][1] + get_settings().rate_limit_window
-                ) if oldest else None
+                "tokens": float(tokens) if tokens is not None else None,
+                "last_request": (
+                    float(last_request) if last_request is not None else None
+                )
             }
 
             return stats
 
         except Exception as e:
-            logger.error(f"Failed to get rate limit stats for {identifier}: {e}")
+            logger.error("Failed to get rate limit stats for %s: %s", identifier, e)
             return {"error": str(e)}
 
 
@@ -4,6 +4,7 @@ Provides secure, high-performance Redis connections with atomic operations.
 """
 import asyncio
 import logging
+import time
 from typing import Any, Dict, Optional
 
 import redis.asyncio as redis
@@ -63,12 +64,12 @@ class RedisConnectionManager:
                 # Test connection
                 await self._redis.ping()
                 logger.info(
-                    f"Redis connection pool initialized with max "
-                    f"{settings.redis_max_connections} connections"
+                    "Redis connection pool initialized with max %s connections",
+                    settings.redis_max_connections
                 )
 
             except Exception as e:
-                logger.error(f"Failed to initialize Redis connection pool: {e}")
+                logger.error("Failed to initialize Redis connection pool: %s", e)
                 await self.close()
                 raise
 
@@ -78,6 +79,17 @@ class RedisConnectionManager:
             await self.initialize()
         return self._redis
 
+    def get_redis_sync(self) -> redis.Redis:
+        """
+        Get the already-initialized Redis client without awaiting.
+
+        For hot paths that run after startup; use get_redis() when the pool
+        may not have been initialized yet.
+        """
+        if self._redis is None:
+            raise RuntimeError("Redis not initialized")
+        return self._redis
+
     async def close(self) -> None:
         """Close Redis connections and cleanup."""
         async with self._lock:
@@ -98,11 +110,9 @@ class RedisConnectionManager:
                 return {"status": "error", "message": "Redis not initialized"}
 
             # Test basic operations
-            start_time = asyncio.get_event_loop().time()
+            start_time = time.perf_counter()
             await self._redis.ping()
-            end_time = asyncio.get_event_loop().time()
-
-            ping_time = (end_time - start_time) * 1000  # Convert to milliseconds
+            ping_time = (time.perf_counter() - start_time) * 1000  # Convert to ms
 
             # Get connection pool info
             pool_info = {
@@ -122,7 +132,7 @@ class RedisConnectionManager:
             }
 
         except Exception as e:
-            logger.error(f"Redis health check failed: {e}")
+            logger.error("Redis health check failed: %s", e)
             return {
                 "status": "error",
                 "message": str(e)
@@ -138,6 +148,11 @@ async def get_redis() -> redis.Redis:
     return await redis_manager.get_redis()
 
 
+def get_redis_sync() -> redis.Redis:
+    """Get initialized Redis client instance (convenience function)."""
+    return redis_manager.get_redis_sync()
+
+
 async def close_redis():
     """Close Redis connections (convenience function)."""
     await redis_manager.close()
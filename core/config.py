@@ -30,6 +30,11 @@ class Settings(BaseSettings):
         default="🔑 DATABASE_URL",
         description="PostgreSQL database connection URL"
     )
+    db_min_size: int = 10
+    db_max_size: int = 50
+    db_max_inactive_connection_lifetime: float = 300.0  # seconds
+    db_max_queries: int = 50_000
+    db_statement_cache_size: int = 1024
 
     # Redis configuration
     redis_url: str = Field(
@@ -4,21 +4,65 @@ Development startup script for BOT application.
 Tests application structure and configuration without external dependencies.
 """
 import os
+import re
 import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
 
-# Add current directory to Python path
-sys.path.insert(0, str(Path(__file__).parent))
+_ROOT = Path(__file__).resolve().parent
+
+# Add project root to Python path (once, even if imported twice)
+if str(_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ROOT))
+
+# Config source is read and compiled once; test_configuration only executes it
+_CONFIG_SRC = (_ROOT / "core" / "config.py").read_bytes()
+_CONFIG_CODE = compile(_CONFIG_SRC, "core/config.py", "exec")
+
+# Dockerfile security features and required compose services
+_DOCKERFILE_CHECKS = [
+    ("Multi-stage build", b"FROM python:3.11-slim AS"),
+    ("Non-root user", b"useradd -r"),
+    ("Health check", b"HEALTHCHECK"),
+    ("Security setup", b"chown -R botuser:botuser"),
+]
+_COMPOSE_SERVICES = [b"app:", b"postgres:", b"redis:"]
+
+# Required sections per security document, as UTF-8 bytes
+_DOC_SECTIONS = [
+    (doc_file, [section.encode() for section in sections])
+    for doc_file, sections in [
+        ("SECURITY.md", ["Security Policy", "Reporting Security Vulnerabilities"]),
+        ("SECRETS.md", ["🔑 Secrets Management", "Setup Instructions"]),
+        ("README.md", ["Security Features", "Quick Start"])
+    ]
+]
+
+
+def _union_pattern(needles):
+    """Compile needles into one alternation so a file is scanned only once."""
+    return re.compile(b"|".join(re.escape(needle) for needle in needles))
+
+
+_DOCKERFILE_PAT = _union_pattern(pattern for _, pattern in _DOCKERFILE_CHECKS)
+_COMPOSE_PAT = _union_pattern(_COMPOSE_SERVICES)
+_DOC_PATS = {
+    doc_file: _union_pattern(sections)
+    for doc_file, sections in _DOC_SECTIONS
+}
 
-# Set test environment variables
-os.environ.update({
+# Default environment; variables already set by the caller take precedence
+_DEFAULT_ENV = {
     "ENVIRONMENT": "development",
     "SECRET_KEY": "test-secret-key-for-development-32-characters-minimum",
     "DATABASE_URL": "postgresql://localhost:5432/botdb",
     "REDIS_URL": "redis://localhost:6379/0",
     "DEBUG": "true",
     "LOG_LEVEL": "INFO"
-})
+}
+for _name, _value in _DEFAULT_ENV.items():
+    os.environ.setdefault(_name, _value)
 
 def test_configuration():
     """Test configuration loading."""
@@ -34,9 +78,7 @@ def test_configuration():
         sys.modules['pydantic.fields'] = pydantic
 
         # Test core config can be imported
-        with open('core/config.py', 'r', encoding='utf-8') as f:
-            config_content = f.read()
-        exec(config_content, {'__name__': '__main__'})  # nosec B102 S102
+        exec(_CONFIG_CODE, {'__name__': '__main__'})  # nosec B102 S102
 
     except Exception:
         return False
@@ -44,49 +86,56 @@ def test_configuration():
     return True
 
 
+def _install_mock_modules():
+    """Install stand-ins for external dependencies; a no-op once installed."""
+    if 'fastapi' in sys.modules:
+        return
+
+    import types
+
+    # Mock FastAPI
+    fastapi = types.ModuleType('fastapi')
+    fastapi.FastAPI = type
+    fastapi.APIRouter = type
+    fastapi.HTTPException = Exception
+    fastapi.Request = object
+    fastapi.WebSocket = object
+    fastapi.WebSocketDisconnect = Exception
+    fastapi.status = types.ModuleType('status')
+    sys.modules['fastapi'] = fastapi
+    sys.modules['fastapi.middleware'] = types.ModuleType('middleware')
+    sys.modules['fastapi.middleware.cors'] = types.ModuleType('cors')
+    sys.modules['fastapi.middleware.trustedhost'] = types.ModuleType('trustedhost')
+    sys.modules['fastapi.responses'] = types.ModuleType('responses')
+    sys.modules['fastapi.exceptions'] = types.ModuleType('exceptions')
+    sys.modules['fastapi.websockets'] = types.ModuleType('websockets')
+    sys.modules['fastapi.testclient'] = types.ModuleType('testclient')
+
+    # Mock other dependencies
+    redis = types.ModuleType('redis')
+    redis.asyncio = types.ModuleType('asyncio')
+    sys.modules['redis'] = redis
+    sys.modules['redis.asyncio'] = redis.asyncio
+
+    asyncpg = types.ModuleType('asyncpg')
+    sys.modules['asyncpg'] = asyncpg
+
+    uvicorn = types.ModuleType('uvicorn')
+    sys.modules['uvicorn'] = uvicorn
+
+    psutil = types.ModuleType('psutil')
+    psutil.cpu_percent = lambda *args, **kwargs: 50.0
+    psutil.virtual_memory = lambda: types.SimpleNamespace(percent=60.0)
+    psutil.disk_usage = lambda path: types.SimpleNamespace(percent=70.0)
+    sys.modules['psutil'] = psutil
+
+
 def test_application_structure():
     """Test application structure."""
 
     # Test imports without external dependencies
     try:
-        # Create mock modules
-        import types
-
-        # Mock FastAPI
-        fastapi = types.ModuleType('fastapi')
-        fastapi.FastAPI = type
-        fastapi.APIRouter = type
-        fastapi.HTTPException = Exception
-        fastapi.Request = object
-        fastapi.WebSocket = object
-        fastapi.WebSocketDisconnect = Exception
-        fastapi.status = types.ModuleType('status')
-        sys.modules['fastapi'] = fastapi
-        sys.modules['fastapi.middleware'] = types.ModuleType('middleware')
-        sys.modules['fastapi.middleware.cors'] = types.ModuleType('cors')
-        sys.modules['fastapi.middleware.trustedhost'] = types.ModuleType('trustedhost')
-        sys.modules['fastapi.responses'] = types.ModuleType('responses')
-        sys.modules['fastapi.exceptions'] = types.ModuleType('exceptions')
-        sys.modules['fastapi.websockets'] = types.ModuleType('websockets')
-        sys.modules['fastapi.testclient'] = types.ModuleType('testclient')
-
-        # Mock other dependencies
-        redis = types.ModuleType('redis')
-        redis.asyncio = types.ModuleType('asyncio')
-        sys.modules['redis'] = redis
-        sys.modules['redis.asyncio'] = redis.asyncio
-
-        asyncpg = types.ModuleType('asyncpg')
-        sys.modules['asyncpg'] = asyncpg
-
-        uvicorn = types.ModuleType('uvicorn')
-        sys.modules['uvicorn'] = uvicorn
-
-        psutil = types.ModuleType('psutil')
-        psutil.cpu_percent = lambda *args, **kwargs: 50.0
-        psutil.virtual_memory = lambda: types.SimpleNamespace(percent=60.0)
-        psutil.disk_usage = lambda path: types.SimpleNamespace(percent=70.0)
-        sys.modules['psutil'] = psutil
+        _install_mock_modules()
 
         # Test syntax of key modules
         test_files = [
@@ -98,12 +147,14 @@ def test_application_structure():
             'app/db/database.py'
         ]
 
-        for file_path in test_files:
-            try:
-                with open(file_path, 'r') as f:
-                    compile(f.read(), file_path, 'exec')
-            except SyntaxError:
-                return False
+        def _compile(file_path):
+            return compile((_ROOT / file_path).read_bytes(), file_path, 'exec')
+
+        try:
+            with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+                list(pool.map(_compile, test_files))
+        except SyntaxError:
+            return False
 
         return True
 
@@ -111,38 +162,45 @@ def test_application_structure():
         return False
 
 
-def test_docker_configuration():
+def _scan_root():
+    """Map project root entry names to paths with a single directory read."""
+    with os.scandir(_ROOT) as it:
+        return {entry.name: entry.path for entry in it}
+
+
+def _read_entry(entries, name):
+    """Read a root-level file found by _scan_root, or None if absent."""
+    path = entries.get(name)
+    return Path(path).read_bytes() if path is not None else None
+
+
+def test_docker_configuration(entries=None):
     """Test Docker configuration."""
 
     try:
+        if entries is None:
+            entries = _scan_root()
+
         # Check Dockerfile
-        dockerfile = Path("Dockerfile")
-        if dockerfile.exists():
-            content = dockerfile.read_text()
+        content = _read_entry(entries, "Dockerfile")
 
+        if content is not None:
             # Check security features
-            checks = [
-                ("Multi-stage build", "FROM python:3.11-slim AS"),
-                ("Non-root user", "useradd -r"),
-                ("Health check", "HEALTHCHECK"),
-                ("Security setup", "chown -R botuser:botuser"),
-            ]
-
-            for _check_name, check_pattern in checks:
-                if check_pattern in content:
+            found = set(_DOCKERFILE_PAT.findall(content))
+            for _check_name, check_pattern in _DOCKERFILE_CHECKS:
+                if check_pattern in found:
                     pass
                 else:
                     pass
 
         # Check docker-compose
-        compose_file = Path("docker-compose.yml")
-        if compose_file.exists():
-            content = compose_file.read_text()
+        content = _read_entry(entries, "docker-compose.yml")
 
+        if content is not None:
             # Check required services
-            services = ["app:", "postgres:", "redis:"]
-            for service in services:
-                if service in content:
+            found = set(_COMPOSE_PAT.findall(content))
+            for service in _COMPOSE_SERVICES:
+                if service in found:
                     pass
                 else:
                     pass
@@ -153,48 +211,56 @@ def test_docker_configuration():
         return False
 
 
-def test_security_documentation():
+def test_security_documentation(entries=None):
     """Test security documentation."""
 
-    docs = [
-        ("SECURITY.md", ["Security Policy", "Reporting Security Vulnerabilities"]),
-        ("SECRETS.md", ["🔑 Secrets Management", "Setup Instructions"]),
-        ("README.md", ["Security Features", "Quick Start"])
-    ]
+    if entries is None:
+        entries = _scan_root()
+
+    for doc_file, required_sections in _DOC_SECTIONS:
+        content = _read_entry(entries, doc_file)
 
-    for doc_file, required_sections in docs:
-        if Path(doc_file).exists():
-            content = Path(doc_file).read_text()
+        if content is not None:
+            found = set(_DOC_PATS[doc_file].findall(content))
 
-            missing_sections = []
-            for section in required_sections:
-                if section not in content:
-                    missing_sections.append(section)
+            # Common case: everything present, stop at the first miss otherwise
+            if all(section in found for section in required_sections):
+                continue
 
+            # Slow path, only to report what is missing
+            missing_sections = [
+                section for section in required_sections if section not in found
+            ]
             if missing_sections:
                 pass
-            else:
-                pass
         else:
             pass
 
     return True
 
 
+def _run(test):
+    """Run one test in a worker process."""
+    return test()
+
+
 def main():
     """Run all tests."""
 
+    # One directory read locates every root-level file the checks look at
+    entries = _scan_root()
+
     tests = [
         test_configuration,
         test_application_structure,
-        test_docker_configuration,
-        test_security_documentation
+        partial(test_docker_configuration, entries),
+        partial(test_security_documentation, entries)
     ]
 
-    results = []
-    for test in tests:
-        result = test()
-        results.append(result)
+    # Tests are independent; each runs in its own process so the sys.modules
+    # stand-ins installed by one never leak into another
+    with ProcessPoolExecutor(max_workers=len(tests)) as pool:
+        results = list(pool.map(_run, tests))
 
     # Summary
     if all(results):
@@ -9,13 +9,16 @@ from pathlib import Path
 import pytest
 import pytest_asyncio
 from fastapi.testclient import TestClient
-from httpx import AsyncClient
+from httpx import ASGITransport, AsyncClient
 
 # Add project root to Python path for imports
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
+project_root = Path(__file__).resolve().parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
 
 from app.main import app  # noqa: E402
+from app.services.rate_limiter import rate_limiter  # noqa: E402
+from app.services.redis_service import redis_manager  # noqa: E402
 from core.config import reset_settings  # noqa: E402
 
 # Set test environment
@@ -39,22 +42,36 @@ def event_loop():
     loop.close()
 
 
-@pytest_asyncio.fixture
+@pytest_asyncio.fixture(scope="session")
 async def client():
-    """Create test client."""
-    async with AsyncClient(app=app, base_url="http://test") as ac:
+    """Create test client, shared by the whole session."""
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as ac:
         yield ac
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sync_client():
-    """Create synchronous test client."""
+    """Create synchronous test client, shared by the whole session."""
     return TestClient(app)
 
 
-@pytest.fixture(autouse=True)
+@pytest.fixture
 def reset_config():
-    """Reset configuration for each test."""
+    """Reset configuration around a test (opt in from tests that change it)."""
     reset_settings()
     yield
     reset_settings()
+
+
+@pytest.fixture
+def fresh_state(monkeypatch):
+    """
+    Start a lifespan (``with TestClient(app)``) from fresh pools.
+
+    The shared ones used by other tests then survive this lifespan's shutdown.
+    """
+    monkeypatch.setattr(redis_manager, "_pool", None)
+    monkeypatch.setattr(redis_manager, "_redis", None)
+    monkeypatch.setattr(rate_limiter, "_script_shas", {})
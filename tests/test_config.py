@@ -7,14 +7,36 @@ import pytest
 
 from core.config import get_settings, reset_settings
 
+pytestmark = pytest.mark.usefixtures("reset_config")
 
-def test_settings_initialization():
-    """Test settings initialization with defaults."""
-    settings = get_settings()
-    assert settings.app_name == "BOT"
-    assert settings.app_version == "1.0.0"
-    assert settings.websocket_max_message_size == 16 * 1024  # 16KB
-    assert settings.redis_max_connections == 50
+
+@pytest.fixture(scope="module")
+def settings():
+    """Settings built once for the tests that only read them."""
+    reset_settings()
+    return get_settings()
+
+
+@pytest.mark.parametrize("attr,expected", [
+    ("app_name", "BOT"),
+    ("app_version", "1.0.0"),
+    ("websocket_max_message_size", 16 * 1024),  # 16KB exactly
+    ("rate_limit_requests", 100),
+    ("rate_limit_window", 60),
+    ("rate_limit_burst", 20),
+    ("health_check_timeout", 0.1),  # 100ms
+    ("redis_max_connections", 50),
+    ("redis_socket_timeout", 5.0),
+    ("redis_socket_connect_timeout", 5.0),
+    ("db_min_size", 10),
+    ("db_max_size", 50),
+    ("db_max_inactive_connection_lifetime", 300.0),
+    ("db_max_queries", 50_000),
+    ("db_statement_cache_size", 1024),
+])
+def test_settings_defaults(settings, attr, expected):
+    """Test settings defaults."""
+    assert getattr(settings, attr) == expected
 
 
 def test_secret_key_validation():
@@ -37,34 +59,6 @@ def test_cors_validation_development():
     assert isinstance(settings.cors_origins, list)
 
 
-def test_websocket_message_size_limit():
-    """Test WebSocket message size configuration."""
-    settings = get_settings()
-    assert settings.websocket_max_message_size == 16384  # 16KB exactly
-
-
-def test_rate_limiting_config():
-    """Test rate limiting configuration."""
-    settings = get_settings()
-    assert settings.rate_limit_requests == 100
-    assert settings.rate_limit_window == 60
-    assert settings.rate_limit_burst == 20
-
-
-def test_health_check_timeout():
-    """Test health check timeout configuration."""
-    settings = get_settings()
-    assert settings.health_check_timeout == 0.1  # 100ms
-
-
-def test_redis_connection_config():
-    """Test Redis connection configuration."""
-    settings = get_settings()
-    assert settings.redis_max_connections == 50
-    assert settings.redis_socket_timeout == 5.0
-    assert settings.redis_socket_connect_timeout == 5.0
-
-
 @pytest.mark.parametrize("env_var,expected", [
     ("DEBUG", False),
     ("LOG_LEVEL", "INFO"),
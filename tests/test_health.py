@@ -71,11 +71,9 @@ async def test_health_check_response_time(client: AsyncClient):
     """Test health check meets response time requirements."""
     import time
 
-    start_time = time.time()
+    start_ns = time.perf_counter_ns()
     response = await client.get("/health/")
-    end_time = time.time()
-
-    response_time_ms = (end_time - start_time) * 1000
+    response_time_ms = (time.perf_counter_ns() - start_ns) / 1_000_000
 
     # Should generally be under 100ms, but allow margin for CI
     assert response_time_ms < 500
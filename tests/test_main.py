@@ -0,0 +1,51 @@
+"""
+Test application startup and shutdown.
+"""
+import pytest
+from fastapi.testclient import TestClient
+
+from app.db import database
+from app.db.database import db_manager
+from app.main import app
+from app.services.rate_limiter import rate_limiter
+from app.services.redis_service import redis_manager
+from core.config import get_settings
+
+
+@pytest.mark.usefixtures("fresh_state")
+def test_lifespan_startup_and_shutdown():
+    """Test startup initializes dependencies and preloads the rate limit script."""
+    settings = get_settings()
+    params = (
+        settings.rate_limit_requests,
+        settings.rate_limit_window,
+        settings.rate_limit_burst,
+    )
+
+    with TestClient(app) as test_client:
+        assert params in rate_limiter._script_shas
+        assert db_manager._ready.is_set()
+
+        response = test_client.get("/health/liveness")
+        assert response.status_code == 200
+
+    assert redis_manager._redis is None
+    assert not db_manager._ready.is_set()
+
+
+@pytest.mark.usefixtures("fresh_state")
+def test_lifespan_survives_database_outage(monkeypatch):
+    """Test the app still starts when the database is unreachable."""
+
+    async def unreachable(*args, **kwargs):
+        raise ConnectionRefusedError("database down")
+
+    monkeypatch.setattr(database.asyncpg, "create_pool", unreachable)
+
+    with TestClient(app) as test_client:
+        assert not db_manager._ready.is_set()
+        with pytest.raises(RuntimeError):
+            db_manager.get_connection()
+
+        response = test_client.get("/health/")
+        assert response.status_code == 200
@@ -0,0 +1,113 @@
+"""
+Test request middleware.
+"""
+import time
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.main import create_app
+from app.services.rate_limiter import rate_limiter
+from core.config import get_settings
+
+# Above GZipMiddleware's 1000 byte minimum_size
+_LARGE_BODY = {"data": "x" * 2048}
+
+
+@pytest.mark.asyncio
+async def test_security_headers(client: AsyncClient):
+    """Test security headers are added to responses."""
+    response = await client.get("/")
+
+    assert response.headers["X-Content-Type-Options"] == "nosniff"
+    assert response.headers["X-Frame-Options"] == "DENY"
+    assert response.headers["X-XSS-Protection"] == "1; mode=block"
+    assert response.headers["Referrer-Policy"] == "strict-origin-when-cross-origin"
+    assert "default-src 'self'" in response.headers["Content-Security-Policy"]
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_headers(client: AsyncClient):
+    """Test rate limit headers are added to non-health responses."""
+    response = await client.get("/")
+
+    assert "X-RateLimit-Limit" in response.headers
+    assert "X-RateLimit-Remaining" in response.headers
+    assert "X-RateLimit-Reset" in response.headers
+    assert "X-Process-Time" in response.headers
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_response(client: AsyncClient, monkeypatch):
+    """Test denied requests get a positive Retry-After and the bucket capacity."""
+
+    async def denied(identifier, **kwargs):
+        return {
+            "allowed": False,
+            "current_count": 0,
+            "limit": kwargs["limit"],
+            "reset_time": time.time() + 0.2,
+            "remaining": 0,
+        }
+
+    monkeypatch.setattr(rate_limiter, "is_allowed", denied)
+    response = await client.get("/")
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "1"
+    burst = str(get_settings().rate_limit_burst)
+    assert response.headers["X-RateLimit-Limit"] == burst
+    assert response.json()["limit"] == int(burst)
+
+
+@pytest.mark.asyncio
+async def test_health_skips_rate_limit(client: AsyncClient):
+    """Test health endpoints bypass rate limiting."""
+    response = await client.get("/health/")
+
+    assert "X-RateLimit-Limit" not in response.headers
+    assert response.headers["X-Content-Type-Options"] == "nosniff"
+
+
+@pytest.mark.asyncio
+async def test_small_responses_not_compressed(client: AsyncClient):
+    """Test responses below the GZip threshold are sent uncompressed."""
+    response = await client.get("/", headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in response.headers
+    assert response.headers["X-Content-Type-Options"] == "nosniff"
+
+
+@pytest.mark.asyncio
+async def test_large_responses_compressed():
+    """Test responses above the GZip threshold are compressed."""
+    app = create_app()
+
+    @app.get("/large")
+    async def large() -> dict:
+        return _LARGE_BODY
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as ac:
+        response = await ac.get("/large", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.json() == _LARGE_BODY
+    assert response.headers["X-Content-Type-Options"] == "nosniff"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("method", ["GET", "HEAD"])
+async def test_liveness_shortcut(client: AsyncClient, method: str):
+    """Test liveness probes are answered ahead of the middleware stack."""
+    response = await client.request(method, "/health/liveness")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.headers["X-Frame-Options"] == "DENY"
+    assert "X-RateLimit-Limit" not in response.headers
+    if method == "HEAD":
+        assert response.content == b""
+    else:
+        assert response.json()["status"] == "alive"
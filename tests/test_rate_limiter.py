@@ -0,0 +1,72 @@
+"""
+Test rate limiter local state.
+"""
+import time
+
+import pytest
+
+from app.services.rate_limiter import DENY_CACHE_MAX_SIZE, RateLimiter
+
+
+def _denial(reset_time: float) -> dict:
+    return {
+        "allowed": False,
+        "current_count": 10,
+        "limit": 10,
+        "reset_time": reset_time,
+        "remaining": 0
+    }
+
+
+def test_deny_cache_hit_until_reset():
+    """Test cached denials are served until the window resets."""
+    limiter = RateLimiter()
+    now = time.time()
+    limiter._cache_denial("rate_limit:a", _denial(now + 30))
+
+    assert limiter._get_cached_denial("rate_limit:a", now)["allowed"] is False
+    assert limiter._get_cached_denial("rate_limit:a", now + 31) is None
+    assert "rate_limit:a" not in limiter._deny_cache
+
+
+def test_deny_cache_lru_eviction():
+    """Test deny cache evicts least recently used entries when full."""
+    limiter = RateLimiter()
+    reset_time = time.time() + 30
+
+    for i in range(DENY_CACHE_MAX_SIZE + 1):
+        limiter._cache_denial(f"rate_limit:{i}", _denial(reset_time))
+
+    assert len(limiter._deny_cache) == DENY_CACHE_MAX_SIZE
+    assert "rate_limit:0" not in limiter._deny_cache
+
+
+def test_deny_cache_sweep():
+    """Test sweeping drops only expired denials."""
+    limiter = RateLimiter()
+    now = time.time()
+    limiter._cache_denial("rate_limit:old", _denial(now - 1))
+    limiter._cache_denial("rate_limit:new", _denial(now + 30))
+
+    limiter._sweep_deny_cache(now)
+
+    assert list(limiter._deny_cache) == ["rate_limit:new"]
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_allows_burst_then_denies():
+    """Test a full bucket admits burst_limit requests, then denies."""
+    limiter = RateLimiter()
+    await limiter.reset_limit("test:bucket")
+
+    results = [
+        await limiter.is_allowed("test:bucket", limit=60, window=60, burst_limit=3)
+        for _ in range(4)
+    ]
+
+    assert [r["allowed"] for r in results] == [True, True, True, False]
+    assert [r["remaining"] for r in results] == [2, 1, 0, 0]
+    # Refill rate is one token per second
+    assert results[3]["reset_time"] - time.time() <= 1.0
+
+    await limiter.reset_limit("test:bucket")
@@ -1,106 +1,106 @@
 """
 Test WebSocket functionality and security.
 """
+import asyncio
 import json
 
 import pytest
 from fastapi.testclient import TestClient
 
 from app.main import app
+from app.routers.websocket import SEND_QUEUE_MAX_SIZE, ConnectionManager
 
+# Test payloads, encoded once
+_PING_PAYLOAD = json.dumps({"type": "ping"})
+_ECHO_MSG = {"type": "echo", "data": "test message"}
+_ECHO_PAYLOAD = json.dumps(_ECHO_MSG)
+_LARGE_MESSAGE = "x" * (17 * 1024)  # 17KB, over the 16KB limit
+_BROADCAST_PAYLOAD = json.dumps({"type": "broadcast", "message": "Hello everyone!"})
 
-def test_websocket_connection():
-    """Test basic WebSocket connection."""
-    client = TestClient(app)
 
-    with client.websocket_connect("/ws/test-client") as websocket:
-        # Test ping message
-        websocket.send_text(json.dumps({"type": "ping"}))
-        data = websocket.receive_text()
-        response = json.loads(data)
+@pytest.fixture(scope="module")
+def ws(sync_client):
+    """
+    One live connection shared by the request/reply tests below.
 
-        assert response["type"] == "pong"
-        assert "timestamp" in response
+    Each test must read every reply it triggers so the next one starts clean.
+    """
+    with sync_client.websocket_connect("/ws/test-client") as websocket:
+        yield websocket
 
 
-def test_websocket_echo():
-    """Test WebSocket echo functionality."""
-    client = TestClient(app)
+def test_websocket_connection(ws):
+    """Test basic WebSocket connection."""
+    # Test ping message
+    ws.send_text(_PING_PAYLOAD)
+    data = ws.receive_text()
+    response = json.loads(data)
 
-    with client.websocket_connect("/ws/test-client") as websocket:
-        test_message = {"type": "echo", "data": "test message"}
-        websocket.send_text(json.dumps(test_message))
+    assert response["type"] == "pong"
+    assert "timestamp" in response
 
-        data = websocket.receive_text()
-        response = json.loads(data)
 
-        assert response["type"] == "echo_response"
-        assert response["original_message"] == test_message
+def test_websocket_echo(ws):
+    """Test WebSocket echo functionality."""
+    ws.send_text(_ECHO_PAYLOAD)
 
+    data = ws.receive_text()
+    response = json.loads(data)
 
-def test_websocket_message_size_limit():
-    """Test WebSocket message size enforcement."""
-    client = TestClient(app)
+    assert response["type"] == "echo_response"
+    assert response["original_message"] == _ECHO_MSG
 
-    with client.websocket_connect("/ws/test-client") as websocket:
-        # Create message larger than 16KB
-        large_message = "x" * (17 * 1024)  # 17KB
-        websocket.send_text(large_message)
 
-        data = websocket.receive_text()
-        response = json.loads(data)
+def test_websocket_message_size_limit(ws):
+    """Test WebSocket message size enforcement."""
+    ws.send_text(_LARGE_MESSAGE)
 
-        assert "error" in response
-        assert "Message too large" in response["error"]
-        assert response["max_size_bytes"] == 16384
+    data = ws.receive_text()
+    response = json.loads(data)
 
+    assert "error" in response
+    assert "Message too large" in response["error"]
+    assert response["max_size_bytes"] == 16384
 
-def test_websocket_text_message():
-    """Test plain text WebSocket message handling."""
-    client = TestClient(app)
 
-    with client.websocket_connect("/ws/test-client") as websocket:
-        websocket.send_text("Hello, WebSocket!")
+def test_websocket_text_message(ws):
+    """Test plain text WebSocket message handling."""
+    ws.send_text("Hello, WebSocket!")
 
-        data = websocket.receive_text()
-        response = json.loads(data)
+    data = ws.receive_text()
+    response = json.loads(data)
 
-        assert response["type"] == "text_echo"
-        assert response["message"] == "Hello, WebSocket!"
+    assert response["type"] == "text_echo"
+    assert response["message"] == "Hello, WebSocket!"
 
 
-def test_websocket_invalid_client_id():
+def test_websocket_invalid_client_id(sync_client):
     """Test WebSocket with invalid client ID."""
-    client = TestClient(app)
-
     # Empty client ID should be rejected
     with pytest.raises(
         (ValueError, ConnectionError, RuntimeError)
-    ), client.websocket_connect("/ws/"):
+    ), sync_client.websocket_connect("/ws/"):
         pass
 
     # Very long client ID should be rejected
     long_id = "x" * 200
     with pytest.raises(
         (ValueError, ConnectionError, RuntimeError)
-    ), client.websocket_connect(f"/ws/{long_id}"):
+    ), sync_client.websocket_connect(f"/ws/{long_id}"):
         pass
 
 
+@pytest.mark.usefixtures("fresh_state")
 def test_websocket_broadcast():
     """Test WebSocket broadcast functionality."""
-    client = TestClient(app)
-
-    # Create two connections
-    with client.websocket_connect("/ws/client1") as ws1, \
-         client.websocket_connect("/ws/client2") as ws2:
+    # Within one client session both sockets share an event loop, so one
+    # connection's handler can wake the other's writer
+    with TestClient(app) as test_client, \
+         test_client.websocket_connect("/ws/client1") as ws1, \
+         test_client.websocket_connect("/ws/client2") as ws2:
 
         # Send broadcast from client1
-        broadcast_msg = {
-            "type": "broadcast",
-            "message": "Hello everyone!"
-        }
-        ws1.send_text(json.dumps(broadcast_msg))
+        ws1.send_text(_BROADCAST_PAYLOAD)
 
         # Client2 should receive the broadcast
         data = ws2.receive_text()
@@ -123,3 +123,64 @@ async def test_websocket_stats_endpoint(client):
     assert "connections" in data
     assert isinstance(data["total_connections"], int)
     assert isinstance(data["connections"], dict)
+
+
+@pytest.mark.asyncio
+async def test_slow_consumer_disconnected_when_queue_full():
+    """Test clients whose send queue overflows are disconnected."""
+    stalled = asyncio.Event()
+    close_codes = []
+
+    class StalledWebSocket:
+        async def accept(self):
+            pass
+
+        async def send_text(self, message):
+            await stalled.wait()
+
+        async def close(self, code=1000, reason=None):
+            close_codes.append(code)
+
+    manager = ConnectionManager()
+    assert await manager.connect(StalledWebSocket(), "slow-client")
+
+    for _ in range(SEND_QUEUE_MAX_SIZE + 2):
+        await manager.send_personal_message('{"type": "pong"}', "slow-client")
+
+    assert "slow-client" not in manager.active_connections
+    await asyncio.sleep(0)
+    assert close_codes == [1013]
+    assert not await manager.send_personal_message("{}", "slow-client")
+
+
+@pytest.mark.asyncio
+async def test_reconnect_replaces_previous_connection():
+    """Test a reconnect cancels the old writer and survives the old teardown."""
+
+    class RecordingWebSocket:
+        def __init__(self):
+            self.sent = asyncio.Queue()
+
+        async def accept(self):
+            pass
+
+        async def send_text(self, message):
+            self.sent.put_nowait(message)
+
+    manager = ConnectionManager()
+    old, new = RecordingWebSocket(), RecordingWebSocket()
+    assert await manager.connect(old, "reconnecting-client")
+    old_writer = manager._writer_tasks["reconnecting-client"]
+    assert await manager.connect(new, "reconnecting-client")
+
+    with pytest.raises(asyncio.CancelledError):
+        await asyncio.wait_for(old_writer, timeout=1)
+
+    # The old endpoint exiting must leave the new connection registered
+    manager.disconnect("reconnecting-client", old)
+    assert manager.active_connections["reconnecting-client"] is new
+    assert await manager.send_personal_message("{}", "reconnecting-client")
+    assert await asyncio.wait_for(new.sent.get(), timeout=1) == "{}"
+
+    manager.disconnect("reconnecting-client", new)
+    assert "reconnecting-client" not in manager.active_connections